@@ -3,41 +3,57 @@ Analyze the winter battery reserve feature.
 Shows how battery SOC behaves during winter months (December & January).
 """
 
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib.dates as mdates
-from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description='Analyze the winter battery reserve feature.')
+parser.add_argument('--show', action='store_true',
+                    help='Show the figure in an interactive window after saving')
+args = parser.parse_args()
 
 # Load simulation results
 results = pd.read_csv('output/simulation_results.csv', index_col=0)
 
 # Create date column
-start_date = datetime(2024, 1, 1)
-results['date'] = [start_date + timedelta(hours=i) for i in range(len(results))]
+results['date'] = pd.date_range('2024-01-01', periods=len(results), freq='h')
 results['month'] = results['date'].dt.month
+results['soc_pct'] = results['battery_soc'].to_numpy() * 100
 
 # Filter for winter months (December and January)
-winter_data = results[results['month'].isin([12, 1])].copy()
-other_months = results[~results['month'].isin([12, 1])].copy()
+months = results['month'].to_numpy()
+winter_mask = (months == 1) | (months == 12)
+winter_data = results.iloc[winter_mask]
+other_months = results.iloc[~winter_mask]
 
 # Create visualization
-fig, axes = plt.subplots(3, 1, figsize=(14, 12))
+# Render off-screen without pyplot unless the figure should be shown interactively
+if args.show:
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(14, 12))
+else:
+    fig = Figure(figsize=(14, 12))
+    FigureCanvasAgg(fig)
+axes = fig.subplots(3, 1)
 fig.suptitle('Winter Battery Reserve Analysis (December & January)', 
              fontsize=16, fontweight='bold')
 
 # Plot 1: Battery SOC throughout the year with winter highlighted
+# Daily means are enough for the full-year view (365 instead of 8760 points)
+daily = results.set_index('date').resample('D').mean(numeric_only=True)
+daily_months = daily.index.month.to_numpy()
 ax = axes[0]
-ax.plot(results['date'], results['battery_soc'] * 100, 
+ax.plot(daily.index, daily['soc_pct'], 
         label='Battery SOC', color='green', linewidth=1.5)
 ax.axhline(y=50, color='red', linestyle='--', linewidth=2, 
            label='Winter Reserve (50%)', alpha=0.7)
 
 # Highlight winter months
-for month in [1, 12]:
-    month_data = results[results['month'] == month]
-    if len(month_data) > 0:
-        ax.fill_between(month_data['date'], 0, 100, 
-                        alpha=0.2, color='lightblue', label='Winter Period' if month == 1 else '')
+ax.fill_between(daily.index, 0, 100, where=(daily_months == 1) | (daily_months == 12), step='post',
+                alpha=0.2, color='lightblue', label='Winter Period')
 
 ax.set_ylabel('Battery SOC (%)', fontsize=12)
 ax.set_title('Battery State of Charge - Full Year', fontsize=13, fontweight='bold')
@@ -50,12 +66,12 @@ ax.xaxis.set_major_locator(mdates.MonthLocator())
 # Plot 2: Detailed winter SOC
 ax = axes[1]
 if len(winter_data) > 0:
-    ax.plot(winter_data['date'], winter_data['battery_soc'] * 100, 
+    ax.plot(winter_data['date'], winter_data['soc_pct'], 
             label='Battery SOC (Winter)', color='blue', linewidth=2)
     ax.axhline(y=50, color='red', linestyle='--', linewidth=2, 
                label='Minimum Reserve (50%)', alpha=0.7)
-    ax.fill_between(winter_data['date'], 50, winter_data['battery_soc'] * 100, 
-                    where=(winter_data['battery_soc'] * 100 >= 50), 
+    ax.fill_between(winter_data['date'], 50, winter_data['soc_pct'], 
+                    where=(winter_data['soc_pct'].to_numpy() >= 50), 
                     alpha=0.3, color='green', label='Above Reserve')
     ax.fill_between(winter_data['date'], 0, 50, 
                     alpha=0.2, color='red', label='Reserve Zone')
@@ -70,16 +86,12 @@ ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=2))
 
 # Plot 3: Grid dependency comparison
 ax = axes[2]
-winter_grid_import = winter_data.groupby('month')['grid_import'].sum()
-other_grid_import = other_months.groupby('month')['grid_import'].sum()
-
-all_months = pd.DataFrame({
-    'month': range(1, 13),
-    'grid_import': [winter_grid_import.get(m, other_grid_import.get(m, 0)) for m in range(1, 13)]
-})
+grid_by_month = np.bincount(months, weights=results['grid_import'].to_numpy(), minlength=13)[1:]
+winter_grid_import = grid_by_month[[0, 11]].sum()
+total_grid_import = grid_by_month.sum()
 
-colors = ['red' if m in [1, 12] else 'blue' for m in all_months['month']]
-bars = ax.bar(all_months['month'], all_months['grid_import'], color=colors, alpha=0.7)
+colors = ['red' if m in [1, 12] else 'blue' for m in range(1, 13)]
+bars = ax.bar(np.arange(1, 13), grid_by_month, color=colors, alpha=0.7)
 
 # Add legend
 from matplotlib.patches import Patch
@@ -95,8 +107,8 @@ ax.set_xticklabels(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
 ax.grid(True, alpha=0.3, axis='y')
 
-plt.tight_layout()
-plt.savefig('output/winter_reserve_analysis.png', dpi=150, bbox_inches='tight')
+fig.tight_layout()
+fig.savefig('output/winter_reserve_analysis.png', dpi=150, bbox_inches='tight')
 print("Winter reserve analysis saved to: output/winter_reserve_analysis.png")
 
 # Print statistics
@@ -105,19 +117,20 @@ print("Winter Reserve Statistics")
 print("=" * 60)
 
 print(f"\nWinter Months (Dec & Jan):")
-print(f"  Average SOC: {winter_data['battery_soc'].mean() * 100:.2f}%")
-print(f"  Minimum SOC: {winter_data['battery_soc'].min() * 100:.2f}%")
-print(f"  Grid import: {winter_data['grid_import'].sum():.2f} kWh")
+print(f"  Average SOC: {winter_data['soc_pct'].mean():.2f}%")
+print(f"  Minimum SOC: {winter_data['soc_pct'].min():.2f}%")
+print(f"  Grid import: {winter_grid_import:.2f} kWh")
 print(f"  Times below 50% SOC: {(winter_data['battery_soc'] < 0.5).sum()} hours")
 
 print(f"\nOther Months:")
-print(f"  Average SOC: {other_months['battery_soc'].mean() * 100:.2f}%")
-print(f"  Minimum SOC: {other_months['battery_soc'].min() * 100:.2f}%")
-print(f"  Grid import: {other_months['grid_import'].sum():.2f} kWh")
+print(f"  Average SOC: {other_months['soc_pct'].mean():.2f}%")
+print(f"  Minimum SOC: {other_months['soc_pct'].min():.2f}%")
+print(f"  Grid import: {total_grid_import - winter_grid_import:.2f} kWh")
 
 print(f"\nWinter Reserve Impact:")
-winter_import_pct = (winter_data['grid_import'].sum() / results['grid_import'].sum()) * 100
+winter_import_pct = (winter_grid_import / total_grid_import) * 100
 print(f"  Winter months account for {winter_import_pct:.1f}% of total grid import")
 print(f"  Reserve ensures battery stays charged for outages during low solar months")
 
-plt.show()
+if args.show:
+    plt.show()
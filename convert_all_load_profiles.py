@@ -3,24 +3,65 @@ Convert all load profile CSVs from the Dataset on Hourly Load Profiles folder
 to the simulation input format: hour,load_kw
 Saves converted files to input_data/load_profiles/
 """
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
-def convert_load_profile(input_path, output_path):
-    """Convert a single load profile to hour,load_kw format."""
+# Hour labels for the standard 8760-hour year, built once and shared by every conversion
+_HOUR_LABELS_8760 = [f"{hour}," for hour in range(8760)]
+
+
+def hour_labels(num_hours):
+    """Return the 'hour,' prefixes of the output rows (cached for 8760-hour profiles)."""
+    if num_hours == 8760:
+        return _HOUR_LABELS_8760
+    return [f"{hour}," for hour in range(num_hours)]
+
+
+def read_load_values(input_path):
+    """Read the load column of a profile CSV (header in the first row)."""
     try:
+        # Fast path: a single numeric column, parsed straight into an array
+        return np.loadtxt(input_path, delimiter=',', skiprows=1, usecols=0, dtype=np.float64,
+                          ndmin=1)
+    except ValueError:
         df = pd.read_csv(input_path, header=0)
         # If the first column is not numeric, drop it (could be a timestamp or index)
         if not pd.api.types.is_numeric_dtype(df.iloc[:,0]):
             df = df.iloc[:, 1:]
         # Use the first column as load
-        load = df.iloc[:,0].values
-        out = pd.DataFrame({
-            'hour': range(len(load)),
-            'load_kw': load
-        })
-        out.to_csv(output_path, index=False)
+        return df.iloc[:,0].to_numpy()
+
+
+def convert_load_profile(input_path, output_path, output_format='csv'):
+    """Convert a single load profile to hour,load_kw format.
+
+    Args:
+        input_path: Path to the source load profile CSV
+        output_path: Path of the converted file
+        output_format: 'csv' (default) or 'parquet' (int32 hour, float32 load;
+            requires pyarrow)
+
+    Returns:
+        True if the file was converted, False otherwise
+    """
+    try:
+        load = read_load_values(input_path)
+        if output_format == 'parquet':
+            out = pd.DataFrame({
+                'hour': np.arange(len(load), dtype=np.int32),
+                'load_kw': load.astype(np.float32),
+            })
+            out.to_parquet(output_path, index=False, compression='zstd')
+            return True
+        # Write all rows in one call; repr() keeps the same number formatting as to_csv
+        with open(output_path, 'w', newline='') as f:
+            f.write('hour,load_kw\n')
+            f.write(''.join([f"{label}{value!r}\n"
+                             for label, value in zip(hour_labels(len(load)), load.tolist())]))
         return True
     except Exception as e:
         print(f"Error converting {input_path}: {e}")
@@ -30,23 +71,38 @@ def convert_load_profile(input_path, output_path):
 source_folder = Path("Dataset on Hourly Load Profiles for 24 Facilities (8760 hours)")
 dest_folder = Path("input_data/load_profiles")
 
-# Create destination folder if it doesn't exist
-dest_folder.mkdir(parents=True, exist_ok=True)
-
-# Convert all CSV files in the source folder
-csv_files = list(source_folder.glob("*.csv"))
-print(f"Found {len(csv_files)} CSV files in {source_folder}")
-print(f"Converting to {dest_folder}...\n")
-
-success_count = 0
-for csv_file in csv_files:
-    # Create output filename (sanitize the name)
-    output_name = csv_file.stem.replace(" ", "_").replace("-", "_") + ".csv"
-    output_path = dest_folder / output_name
-    
-    print(f"Converting: {csv_file.name} -> {output_name}")
-    if convert_load_profile(csv_file, output_path):
-        success_count += 1
-
-print(f"\n✓ Successfully converted {success_count}/{len(csv_files)} files")
-print(f"Output location: {dest_folder.absolute()}")
+
+def output_name_for(csv_file, output_format='csv'):
+    """Create the sanitized output filename for a source CSV."""
+    return csv_file.stem.replace(" ", "_").replace("-", "_") + "." + output_format
+
+
+def _convert_one(csv_file, output_format='csv'):
+    """Convert one source file into dest_folder (runs in a worker process)."""
+    return convert_load_profile(csv_file, dest_folder / output_name_for(csv_file, output_format),
+                                output_format)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert load profiles to the simulation input format.')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                        help='Output file format (parquet requires pyarrow)')
+    args = parser.parse_args()
+
+    # Create destination folder if it doesn't exist
+    dest_folder.mkdir(parents=True, exist_ok=True)
+
+    # Convert all CSV files in the source folder
+    csv_files = list(source_folder.glob("*.csv"))
+    print(f"Found {len(csv_files)} CSV files in {source_folder}")
+    print(f"Converting to {dest_folder}...\n")
+
+    for csv_file in csv_files:
+        print(f"Converting: {csv_file.name} -> {output_name_for(csv_file, args.format)}")
+
+    # Files are independent, so convert them in parallel
+    with ProcessPoolExecutor() as ex:
+        success_count = sum(ex.map(_convert_one, csv_files, [args.format] * len(csv_files)))
+
+    print(f"\n✓ Successfully converted {success_count}/{len(csv_files)} files")
+    print(f"Output location: {dest_folder.absolute()}")
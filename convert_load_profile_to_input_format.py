@@ -6,20 +6,14 @@ Usage:
     python convert_load_profile_to_input_format.py input_file.csv output_file.csv
 """
 import sys
-import pandas as pd
+from convert_all_load_profiles import hour_labels, read_load_values
 
 def convert_load_profile(input_path, output_path):
-    df = pd.read_csv(input_path, header=0)
-    # If the first column is not numeric, drop it (could be a timestamp or index)
-    if not pd.api.types.is_numeric_dtype(df.iloc[:,0]):
-        df = df.iloc[:, 1:]
-    # Use the first column as load
-    load = df.iloc[:,0].values
-    out = pd.DataFrame({
-        'hour': range(len(load)),
-        'load_kw': load
-    })
-    out.to_csv(output_path, index=False)
+    load = read_load_values(input_path).tolist()
+    # repr() keeps the same number formatting as DataFrame.to_csv
+    with open(output_path, 'w', newline='') as f:
+        f.write('hour,load_kw\n')
+        f.write(''.join([f"{label}{value!r}\n" for label, value in zip(hour_labels(len(load)), load)]))
     print(f'Converted {input_path} to {output_path} (columns: hour, load_kw)')
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""
+Convert the grid stability (outage) CSVs in input_data/ to Parquet.
+Output columns: hour (int32), grid_stable (bool)
+Saves input_data/grid_stability_*.parquet next to the source CSVs.
+Requires pyarrow.
+"""
+from pathlib import Path
+import pandas as pd
+
+
+def convert_outage_file(input_path, output_path):
+    """Convert a single hour,grid_stable CSV to Parquet."""
+    try:
+        df = pd.read_csv(input_path, usecols=['hour', 'grid_stable'],
+                         dtype={'hour': 'int32', 'grid_stable': 'bool'})
+        df.to_parquet(output_path, index=False, compression='zstd')
+        return True
+    except Exception as e:
+        print(f"Error converting {input_path}: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    input_folder = Path("input_data")
+    csv_files = sorted(input_folder.glob("grid_stability_*.csv"))
+    print(f"Found {len(csv_files)} outage files in {input_folder}")
+
+    success_count = 0
+    for csv_file in csv_files:
+        print(f"Converting: {csv_file.name} -> {csv_file.with_suffix('.parquet').name}")
+        if convert_outage_file(csv_file, csv_file.with_suffix('.parquet')):
+            success_count += 1
+
+    print(f"\n✓ Successfully converted {success_count}/{len(csv_files)} files")
@@ -0,0 +1,179 @@
+"""
+Compiled kernels for the energy system simulation.
+The battery state of charge recurrence is the only serial part of a simulation;
+these functions run it on plain NumPy arrays so numba can compile them.
+outage_runs measures the outage periods of a grid stability series.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    # numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+
+@njit(cache=True)
+def battery_recurrence(remaining_pv, remaining_load, min_battery_energy, capacity, efficiency,
+                       inv_efficiency, self_discharge, energy, pv_to_battery,
+                       battery_to_load, battery_energy_kwh):
+    """
+    Run the battery state of charge recurrence over all time steps.
+    
+    Args:
+        remaining_pv: PV energy left after feeding the load (kWh per step)
+        remaining_load: Load left after PV (kWh per step)
+        min_battery_energy: Reserve energy in kWh the battery may not be discharged below (per step)
+        capacity: Battery capacity in kWh
+        efficiency: Battery charge/discharge efficiency (0-1)
+        inv_efficiency: 1 / efficiency
+        self_discharge: Self-discharge multiplier per step (1 - rate * timestep_hours)
+        energy: Initial battery energy in kWh
+        pv_to_battery: Output array for PV energy charged into the battery
+        battery_to_load: Output array for battery energy delivered to the load
+        battery_energy_kwh: Output array for battery energy after each step
+        
+    Returns:
+        Battery energy in kWh after the last step
+    """
+    for i, (excess_pv, deficit, reserve) in enumerate(
+            zip(remaining_pv, remaining_load, min_battery_energy)):
+        # Step 2: Charge battery from PV excess (zero excess gives a zero flow)
+        charged = max(min(excess_pv, (capacity - energy) * inv_efficiency), 0.0)
+        charged_energy = energy + charged * efficiency
+        pv_to_battery[i] = charged
+        
+        # Step 3: Discharge battery to the load (respecting reserve policy)
+        max_discharge = max(charged_energy - reserve, 0.0) * efficiency
+        # Below the reserve limit only the energy above the reserve is requested
+        requested_discharge = deficit if max_discharge >= deficit else max_discharge * inv_efficiency
+        discharged = max(min(requested_discharge, charged_energy * efficiency), 0.0)
+        battery_to_load[i] = discharged
+        
+        # Discharge and self-discharge in a single update
+        energy = (charged_energy - discharged * inv_efficiency) * self_discharge
+        battery_energy_kwh[i] = energy
+    return energy
+
+
+if not NUMBA_AVAILABLE:
+    _battery_recurrence_python = battery_recurrence
+    
+    def battery_recurrence(remaining_pv, remaining_load, min_battery_energy, *args):
+        """Plain-Python battery_recurrence: iterate Python floats, not numpy scalars."""
+        return _battery_recurrence_python(remaining_pv.tolist(), remaining_load.tolist(),
+                                          min_battery_energy.tolist(), *args)
+
+
+@njit(parallel=True, cache=True)
+def battery_recurrence_ensemble(remaining_pv, remaining_load, min_battery_energy, capacity,
+                                efficiency, inv_efficiency, self_discharge, energy,
+                                pv_to_battery, battery_to_load, battery_energy_kwh):
+    """
+    Run battery_recurrence for K independent realizations, one per thread.
+    
+    Per-step arrays have shape (K, N) so every realization walks its own
+    contiguous row. Arguments are as for battery_recurrence.
+    
+    Returns:
+        Battery energy in kWh after the last step, shape (K,)
+    """
+    final_energy = np.empty(remaining_pv.shape[0])
+    for k in prange(remaining_pv.shape[0]):
+        final_energy[k] = battery_recurrence(
+            remaining_pv[k], remaining_load[k], min_battery_energy[k], capacity, efficiency,
+            inv_efficiency, self_discharge, energy, pv_to_battery[k], battery_to_load[k],
+            battery_energy_kwh[k]
+        )
+    return final_energy
+
+
+@njit(cache=True)
+def battery_recurrence_batch(remaining_pv, remaining_load, min_battery_energy, capacity,
+                             efficiency, inv_efficiency, self_discharge, energy,
+                             pv_to_battery, battery_to_load, battery_energy_kwh):
+    """
+    Run the battery recurrence for M parameter sets side by side.
+    
+    Same update as battery_recurrence, applied to a state vector with one entry
+    per scenario. Per-step arrays have shape (N, M) so each step reads and writes
+    one contiguous row.
+    
+    Args:
+        remaining_pv: PV energy left after feeding the load, shape (N, M)
+        remaining_load: Load left after PV, shape (N, M)
+        min_battery_energy: Reserve energy in kWh per step, shape (N, M)
+        capacity: Battery capacities in kWh, shape (M,)
+        efficiency: Battery efficiencies, shape (M,)
+        inv_efficiency: 1 / efficiency, shape (M,)
+        self_discharge: Self-discharge multiplier per step
+        energy: Initial battery energies in kWh, shape (M,)
+        pv_to_battery: Output array for PV energy charged into the battery, shape (N, M)
+        battery_to_load: Output array for battery energy delivered to the load, shape (N, M)
+        battery_energy_kwh: Output array for battery energy after each step, shape (N, M)
+        
+    Returns:
+        Battery energies in kWh after the last step, shape (M,)
+    """
+    for i in range(remaining_pv.shape[0]):
+        charged = np.maximum(np.minimum(remaining_pv[i], (capacity - energy) * inv_efficiency), 0.0)
+        charged_energy = energy + charged * efficiency
+        pv_to_battery[i] = charged
+        
+        max_discharge = np.maximum(charged_energy - min_battery_energy[i], 0.0) * efficiency
+        requested_discharge = np.where(max_discharge >= remaining_load[i], remaining_load[i],
+                                       max_discharge * inv_efficiency)
+        discharged = np.maximum(np.minimum(requested_discharge, charged_energy * efficiency), 0.0)
+        battery_to_load[i] = discharged
+        
+        energy = (charged_energy - discharged * inv_efficiency) * self_discharge
+        battery_energy_kwh[i] = energy
+    return energy
+
+
+@njit(cache=True, boundscheck=False)
+def _outage_runs_loop(outage):
+    """
+    Return the durations (in steps) of contiguous outage periods in one pass.
+    
+    Args:
+        outage: Bool array, True where the grid is down
+        
+    Returns:
+        Array with the length of every outage run, in order
+    """
+    n = outage.shape[0]
+    out = np.empty(n, dtype=np.int32)
+    k = 0
+    cur = 0
+    for i in range(n):
+        if outage[i]:
+            cur += 1
+        elif cur:
+            out[k] = cur
+            k += 1
+            cur = 0
+    if cur:
+        out[k] = cur
+        k += 1
+    return out[:k]
+
+
+def _outage_runs_numpy(outage):
+    """Plain-NumPy outage run lengths: find the run edges with np.diff instead of a Python loop."""
+    padded = np.concatenate([[0], np.asarray(outage, dtype=bool).view(np.int8), [0]])
+    diff = np.diff(padded)
+    starts = np.where(diff == 1)[0]
+    ends = np.where(diff == -1)[0]
+    return (ends - starts).astype(np.int32)
+
+
+# The compiled loop when numba is installed, the vectorized version otherwise
+outage_runs = _outage_runs_loop if NUMBA_AVAILABLE else _outage_runs_numpy
@@ -2,12 +2,33 @@
 Example scenarios for the energy system simulation.
 """
 
+from functools import lru_cache
 from energy_system import EnergySystem
 from generate_input_data import generate_sample_data
 import pandas as pd
 import numpy as np
 
 
+@lru_cache(maxsize=None)
+def _read_csv_cached(path: str) -> pd.DataFrame:
+    """Parse an input CSV once; the cached frame is never handed out directly."""
+    return pd.read_csv(path)
+
+
+def _load_csv(path: str) -> pd.DataFrame:
+    """Read an input CSV, reusing the cached parse; every caller gets its own copy."""
+    return _read_csv_cached(path).copy()
+
+
+def load_sample_data() -> pd.DataFrame:
+    """Combine the sample input files into one simulation input frame."""
+    return pd.DataFrame({
+        'irradiation_w_m2': _load_csv('input_data/solar_irradiation.csv')['irradiation_w_m2'],
+        'load_kw': _load_csv('input_data/load_consumption.csv')['load_kw'],
+        'grid_stable': _load_csv('input_data/grid_stability.csv')['grid_stable'].astype(bool)
+    })
+
+
 def scenario_high_pv():
     """Scenario with high PV capacity."""
     print("\n" + "=" * 60)
@@ -16,13 +37,10 @@ def scenario_high_pv():
     
     # Generate data
     generate_sample_data(num_days=3, samples_per_day=24, output_dir="input_data")
+    _read_csv_cached.cache_clear()
     
     # Load data
-    data = pd.DataFrame({
-        'irradiation_w_m2': pd.read_csv('input_data/solar_irradiation.csv')['irradiation_w_m2'],
-        'load_kw': pd.read_csv('input_data/load_consumption.csv')['load_kw'],
-        'grid_stable': pd.read_csv('input_data/grid_stability.csv')['grid_stable'].astype(bool)
-    })
+    data = load_sample_data()
     
     # Run simulation with high PV
     system = EnergySystem(pv_peak_kw=150, battery_capacity_kwh=200)
@@ -40,11 +58,7 @@ def scenario_large_battery():
     print("=" * 60)
     
     # Load data
-    data = pd.DataFrame({
-        'irradiation_w_m2': pd.read_csv('input_data/solar_irradiation.csv')['irradiation_w_m2'],
-        'load_kw': pd.read_csv('input_data/load_consumption.csv')['load_kw'],
-        'grid_stable': pd.read_csv('input_data/grid_stability.csv')['grid_stable'].astype(bool)
-    })
+    data = load_sample_data()
     
     # Run simulation with large battery
     system = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=400)
@@ -62,12 +76,13 @@ def scenario_unstable_grid():
     print("=" * 60)
     
     # Load data
-    irr_data = pd.read_csv('input_data/solar_irradiation.csv')
-    load_data = pd.read_csv('input_data/load_consumption.csv')
+    irr_data = _load_csv('input_data/solar_irradiation.csv')
+    load_data = _load_csv('input_data/load_consumption.csv')
     
     # Create unstable grid scenario
     num_samples = len(irr_data)
-    grid_stable = np.random.choice([True, False], size=num_samples, p=[0.5, 0.5])
+    rng = np.random.default_rng()
+    grid_stable = rng.random(num_samples) < 0.5
     
     data = pd.DataFrame({
         'irradiation_w_m2': irr_data['irradiation_w_m2'],
@@ -92,11 +107,7 @@ def scenario_comparison():
     print("=" * 60)
     
     # Load data
-    data = pd.DataFrame({
-        'irradiation_w_m2': pd.read_csv('input_data/solar_irradiation.csv')['irradiation_w_m2'],
-        'load_kw': pd.read_csv('input_data/load_consumption.csv')['load_kw'],
-        'grid_stable': pd.read_csv('input_data/grid_stability.csv')['grid_stable'].astype(bool)
-    })
+    data = load_sample_data()
     
     configs = [
         ("Small System", 50, 100),
@@ -110,12 +121,17 @@ def scenario_comparison():
     print(f"{'Configuration':<20} {'PV (kW)':<10} {'Battery (kWh)':<15} {'Self-Suff %':<15} {'Net Grid (kWh)':<15}")
     print("-" * 80)
     
-    for name, pv_kw, battery_kwh in configs:
-        system = EnergySystem(pv_peak_kw=pv_kw, battery_capacity_kwh=battery_kwh)
-        results = system.simulate(data)
-        self_suff = results['self_sufficiency'].mean() * 100
-        net_grid = results['net_grid'].sum()
-        print(f"{name:<20} {pv_kw:<10} {battery_kwh:<15} {self_suff:<15.2f} {net_grid:<15.2f}")
+    # All configurations are simulated together in one batched run
+    pv_peaks = np.array([pv_kw for _, pv_kw, _ in configs], dtype=float)
+    capacities = np.array([battery_kwh for _, _, battery_kwh in configs], dtype=float)
+    system = EnergySystem(pv_peak_kw=pv_peaks[0], battery_capacity_kwh=capacities[0])
+    results = system.simulate_batch(data, pv_peaks, capacities,
+                                    np.full(len(configs), system.battery.efficiency))
+    self_suff = results['self_sufficiency'].mean(axis=1) * 100
+    net_grid = results['net_grid'].sum(axis=1)
+    
+    for i, (name, pv_kw, battery_kwh) in enumerate(configs):
+        print(f"{name:<20} {pv_kw:<10} {battery_kwh:<15} {self_suff[i]:<15.2f} {net_grid[i]:<15.2f}")
 
 
 if __name__ == "__main__":
@@ -14,24 +14,20 @@ num_short_outages = 10    # e.g., 10 short events
 short_outage_min = 2      # min duration (hours)
 short_outage_max = 8      # max duration (hours)
 
-np.random.seed(42)  # For reproducibility
+rng = np.random.default_rng(42)  # For reproducibility
 
-grid = np.ones(hours_per_year, dtype=int)
+grid_bool = np.ones(hours_per_year, dtype=bool)
 
-# Place long outages
-for _ in range(num_long_outages):
-    start = np.random.randint(0, hours_per_year - long_outage_max)
-    duration = np.random.randint(long_outage_min, long_outage_max + 1)
-    grid[start:start+duration] = 0
+# Draw all outage starts and durations at once
+long_starts = rng.integers(0, hours_per_year - long_outage_max, num_long_outages)
+long_durations = rng.integers(long_outage_min, long_outage_max + 1, num_long_outages)
+short_starts = rng.integers(0, hours_per_year - short_outage_max, num_short_outages)
+short_durations = rng.integers(short_outage_min, short_outage_max + 1, num_short_outages)
 
-# Place short outages
-for _ in range(num_short_outages):
-    start = np.random.randint(0, hours_per_year - short_outage_max)
-    duration = np.random.randint(short_outage_min, short_outage_max + 1)
-    grid[start:start+duration] = 0
-
-# Convert to True/False
-grid_bool = grid == 1
+# Place long and short outages
+for start, duration in zip(np.concatenate([long_starts, short_starts]),
+                           np.concatenate([long_durations, short_durations])):
+    grid_bool[start:start+duration] = False
 
 # Save to CSV with hour column and header
 df = pd.DataFrame({
@@ -40,6 +36,3 @@ df = pd.DataFrame({
 })
 df.to_csv('input_data/grid_stability_random_texas.csv', index=False)
 print('Random outage file saved as input_data/grid_stability_random_texas.csv (columns: hour, grid_stable)')
-# Save to CSV
-pd.Series(grid).to_csv('input_data/grid_stability_random_texas.csv', index=False, header=False)
-print('Random outage file saved as input_data/grid_stability_random_texas.csv')
@@ -3,12 +3,124 @@ Generate a CSV file simulating seasonal power outages over a year (8760 hours).
 Winter months (December, January, February) have more frequent and longer outages.
 Output columns: hour, grid_stable (True/False)
 """
+from functools import lru_cache
+from types import MappingProxyType
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
 import argparse
 
 
+# Outage profiles selectable with --profile (read-only)
+PROFILES = MappingProxyType({
+    'mild': {
+        'summer_long_outages': 1,
+        'summer_long_min': 6,
+        'summer_long_max': 24,
+        'summer_short_outages': 3,
+        'summer_short_min': 1,
+        'summer_short_max': 4,
+        'winter_long_outages': 3,
+        'winter_long_min': 12,
+        'winter_long_max': 48,
+        'winter_short_outages': 8,
+        'winter_short_min': 2,
+        'winter_short_max': 8,
+    },
+    'moderate': {
+        'summer_long_outages': 2,
+        'summer_long_min': 12,
+        'summer_long_max': 48,
+        'summer_short_outages': 5,
+        'summer_short_min': 1,
+        'summer_short_max': 6,
+        'winter_long_outages': 6,
+        'winter_long_min': 24,
+        'winter_long_max': 96,
+        'winter_short_outages': 15,
+        'winter_short_min': 2,
+        'winter_short_max': 12,
+    },
+    'severe': {
+        'summer_long_outages': 3,
+        'summer_long_min': 18,
+        'summer_long_max': 60,
+        'summer_short_outages': 8,
+        'summer_short_min': 2,
+        'summer_short_max': 8,
+        'winter_long_outages': 10,
+        'winter_long_min': 36,
+        'winter_long_max': 120,
+        'winter_short_outages': 25,
+        'winter_short_min': 3,
+        'winter_short_max': 16,
+    },
+    'extreme': {
+        'summer_long_outages': 4,
+        'summer_long_min': 24,
+        'summer_long_max': 72,
+        'summer_short_outages': 12,
+        'summer_short_min': 2,
+        'summer_short_max': 10,
+        'winter_long_outages': 15,
+        'winter_long_min': 48,
+        'winter_long_max': 168,  # Up to 1 week
+        'winter_short_outages': 35,
+        'winter_short_min': 4,
+        'winter_short_max': 20,
+    }
+})
+
+
+@lru_cache(maxsize=None)
+def season_hours(hours_per_year):
+    """
+    Split the hours of a year into winter and summer hours.
+    
+    The result only depends on hours_per_year, so it is computed once and shared
+    across calls (the returned arrays are read-only).
+    
+    Args:
+        hours_per_year: Total hours to simulate
+        
+    Returns:
+        Tuple of (winter_mask, winter_hours, summer_hours): a per-hour bool mask
+        and the winter and summer index arrays
+    """
+    # Assume starting January 1st; month (1-12) of every hour from one datetime64 array
+    dates = np.datetime64('2024-01-01T00', 'h') + np.arange(hours_per_year)
+    months = dates.astype('datetime64[M]').astype(int) % 12 + 1
+    
+    # Winter months: December (12), January (1), February (2)
+    winter_mask = (months == 12) | (months <= 2)
+    winter_hours = np.flatnonzero(winter_mask)
+    summer_hours = np.flatnonzero(~winter_mask)
+    for arr in (winter_mask, winter_hours, summer_hours):
+        arr.setflags(write=False)
+    return winter_mask, winter_hours, summer_hours
+
+
+def draw_outages(rng, pool, num_outages, min_duration, max_duration):
+    """
+    Draw the start hours and durations of a batch of outages.
+    
+    Args:
+        rng: numpy random Generator
+        pool: Sorted array of hours an outage may start in
+        num_outages: Number of outages to draw
+        min_duration: Minimum outage duration (hours)
+        max_duration: Maximum outage duration (hours)
+        
+    Returns:
+        Tuple of (starts, durations) arrays; both empty if the pool is too short
+    """
+    if len(pool) <= max_duration:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    # Starts are drawn from the pool without its last max_duration hours
+    starts = pool[rng.integers(0, len(pool) - max_duration, size=num_outages)]
+    durations = rng.integers(min_duration, max_duration + 1, size=num_outages)
+    return starts, durations
+
+
 def generate_seasonal_outages(
     hours_per_year=8760,
     # Summer outages (Mar-Nov)
@@ -26,7 +138,9 @@ def generate_seasonal_outages(
     winter_short_min=2,
     winter_short_max=12,
     seed=42,
-    output_file='input_data/grid_stability_seasonal.csv'
+    output_file='input_data/grid_stability_seasonal.csv',
+    output_format='csv',
+    winter_mask=None
 ):
     """
     Generate seasonal outages with more frequent and longer outages in winter.
@@ -47,22 +161,21 @@ def generate_seasonal_outages(
         winter_short_max: Maximum duration for winter short outages (hours)
         seed: Random seed for reproducibility
         output_file: Output CSV file path
+        output_format: 'csv' (default), 'parquet' (requires pyarrow) or 'npz'
+            (bit-packed grid_stable)
+        winter_mask: Optional precomputed per-hour bool mask of winter hours (e.g.
+            season_hours(hours_per_year)[0] reused across a sweep); all other
+            hours are summer. Computed from the calendar when not given.
     """
-    np.random.seed(seed)
-    
-    # Initialize grid as all stable
-    grid = np.ones(hours_per_year, dtype=int)
+    rng = np.random.default_rng(seed)
     
     # Define winter and summer hours
-    # Assume starting January 1st
-    start_date = datetime(2024, 1, 1)
-    dates = [start_date + timedelta(hours=i) for i in range(hours_per_year)]
-    months = [d.month for d in dates]
-    
-    # Winter months: December (12), January (1), February (2)
-    winter_months = [12, 1, 2]
-    winter_hours = [i for i, m in enumerate(months) if m in winter_months]
-    summer_hours = [i for i, m in enumerate(months) if m not in winter_months]
+    if winter_mask is None:
+        winter_mask, winter_hours, summer_hours = season_hours(hours_per_year)
+    else:
+        winter_mask = np.asarray(winter_mask, dtype=bool)
+        winter_hours = np.flatnonzero(winter_mask)
+        summer_hours = np.flatnonzero(~winter_mask)
     
     print(f"Total hours: {hours_per_year}")
     print(f"Winter hours: {len(winter_hours)} ({len(winter_hours)/hours_per_year*100:.1f}%)")
@@ -73,42 +186,42 @@ def generate_seasonal_outages(
     print(f"  Long outages: {summer_long_outages} × {summer_long_min}-{summer_long_max} hours")
     print(f"  Short outages: {summer_short_outages} × {summer_short_min}-{summer_short_max} hours")
     
-    for _ in range(summer_long_outages):
-        if len(summer_hours) > summer_long_max:
-            start_idx = np.random.choice(summer_hours[:-summer_long_max])
-            duration = np.random.randint(summer_long_min, summer_long_max + 1)
-            grid[start_idx:start_idx+duration] = 0
-    
-    for _ in range(summer_short_outages):
-        if len(summer_hours) > summer_short_max:
-            start_idx = np.random.choice(summer_hours[:-summer_short_max])
-            duration = np.random.randint(summer_short_min, summer_short_max + 1)
-            grid[start_idx:start_idx+duration] = 0
+    summer_long = draw_outages(rng, summer_hours, summer_long_outages,
+                               summer_long_min, summer_long_max)
+    summer_short = draw_outages(rng, summer_hours, summer_short_outages,
+                                summer_short_min, summer_short_max)
     
     # Place winter outages
     print(f"\n❄️  Winter Outages (Dec-Feb):")
     print(f"  Long outages: {winter_long_outages} × {winter_long_min}-{winter_long_max} hours")
     print(f"  Short outages: {winter_short_outages} × {winter_short_min}-{winter_short_max} hours")
     
-    for _ in range(winter_long_outages):
-        if len(winter_hours) > winter_long_max:
-            start_idx = np.random.choice(winter_hours[:-winter_long_max])
-            duration = np.random.randint(winter_long_min, winter_long_max + 1)
-            grid[start_idx:start_idx+duration] = 0
+    winter_long = draw_outages(rng, winter_hours, winter_long_outages,
+                               winter_long_min, winter_long_max)
+    winter_short = draw_outages(rng, winter_hours, winter_short_outages,
+                                winter_short_min, winter_short_max)
+    
+    # Mark all drawn outages at once: +1 at every start, -1 after every end,
+    # so the running sum counts the outages covering each hour
+    draws = (summer_long, summer_short, winter_long, winter_short)
+    starts = np.concatenate([starts for starts, _ in draws])
+    ends = np.minimum(starts + np.concatenate([durations for _, durations in draws]),
+                      hours_per_year)
+    delta = (np.bincount(starts, minlength=hours_per_year + 1)
+             - np.bincount(ends, minlength=hours_per_year + 1))
+    outage = np.cumsum(delta[:-1]) > 0
     
-    for _ in range(winter_short_outages):
-        if len(winter_hours) > winter_short_max:
-            start_idx = np.random.choice(winter_hours[:-winter_short_max])
-            duration = np.random.randint(winter_short_min, winter_short_max + 1)
-            grid[start_idx:start_idx+duration] = 0
+    # 1 = stable, 0 = outage, one byte per hour
+    grid = (~outage).view(np.uint8)
     
-    # Convert to True/False
-    grid_bool = grid == 1
+    # Convert to True/False (no copy)
+    grid_bool = grid.view(bool)
     
     # Calculate statistics
-    total_outage_hours = np.sum(grid == 0)
-    winter_outage_hours = np.sum([grid[i] == 0 for i in winter_hours])
-    summer_outage_hours = np.sum([grid[i] == 0 for i in summer_hours])
+    # Summer (0) and winter (1) outage hours in one pass
+    counts = np.bincount(winter_mask.view(np.int8), weights=outage, minlength=2)
+    summer_outage_hours, winter_outage_hours = int(counts[0]), int(counts[1])
+    total_outage_hours = summer_outage_hours + winter_outage_hours
     
     print(f"\n📊 Outage Statistics:")
     print(f"  Total outage hours: {total_outage_hours} ({total_outage_hours/hours_per_year*100:.2f}%)")
@@ -116,14 +229,28 @@ def generate_seasonal_outages(
     print(f"  Summer outage hours: {summer_outage_hours} ({summer_outage_hours/len(summer_hours)*100:.2f}% of summer)")
     print(f"  Winter/Summer ratio: {winter_outage_hours/max(summer_outage_hours,1):.1f}x more outages in winter")
     
-    # Save to CSV with hour column and header
     df = pd.DataFrame({
         'hour': np.arange(hours_per_year),
         'grid_stable': grid_bool
     })
-    df.to_csv(output_file, index=False)
-    print(f"\n✅ Seasonal outage file saved as: {output_file}")
-    print(f"   Columns: hour, grid_stable (True/False)")
+    
+    if output_format == 'parquet':
+        # Same typed columns as convert_outage_files_to_parquet.py
+        df.astype({'hour': 'int32'}).to_parquet(output_file, index=False, compression='zstd')
+        print(f"\n✅ Seasonal outage file saved as: {output_file}")
+        print(f"   Columns: hour (int32), grid_stable (bool)")
+    elif output_format == 'npz':
+        # One bit per hour; np.unpackbits(grid, count=hours) restores grid_stable
+        np.savez_compressed(output_file, grid=np.packbits(grid_bool), hours=hours_per_year)
+        print(f"\n✅ Seasonal outage file saved as: {output_file}")
+        print(f"   Arrays: grid (bit-packed grid_stable), hours")
+    else:
+        # Save to CSV with hour column and header, written in one call (same text as to_csv)
+        with open(output_file, 'w', newline='') as f:
+            f.write('hour,grid_stable\n')
+            f.write(''.join([f"{hour},{stable}\n" for hour, stable in enumerate(grid_bool.tolist())]))
+        print(f"\n✅ Seasonal outage file saved as: {output_file}")
+        print(f"   Columns: hour, grid_stable (True/False)")
     
     return df
 
@@ -132,86 +259,27 @@ def main():
     parser = argparse.ArgumentParser(
         description='Generate seasonal power outage data with more frequent outages in winter.'
     )
-    parser.add_argument('--output', type=str, 
-                       default='input_data/grid_stability_seasonal.csv',
-                       help='Output CSV file path')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Output file path (default: input_data/grid_stability_seasonal.<format>)')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'npz'], default='csv',
+                       help='Output file format (parquet requires pyarrow)')
     parser.add_argument('--seed', type=int, default=42,
                        help='Random seed for reproducibility')
     parser.add_argument('--profile', type=str, default='moderate',
-                       choices=['mild', 'moderate', 'severe', 'extreme'],
+                       choices=list(PROFILES),
                        help='Severity profile for winter outages')
     
     args = parser.parse_args()
     
-    # Define outage profiles
-    profiles = {
-        'mild': {
-            'summer_long_outages': 1,
-            'summer_long_min': 6,
-            'summer_long_max': 24,
-            'summer_short_outages': 3,
-            'summer_short_min': 1,
-            'summer_short_max': 4,
-            'winter_long_outages': 3,
-            'winter_long_min': 12,
-            'winter_long_max': 48,
-            'winter_short_outages': 8,
-            'winter_short_min': 2,
-            'winter_short_max': 8,
-        },
-        'moderate': {
-            'summer_long_outages': 2,
-            'summer_long_min': 12,
-            'summer_long_max': 48,
-            'summer_short_outages': 5,
-            'summer_short_min': 1,
-            'summer_short_max': 6,
-            'winter_long_outages': 6,
-            'winter_long_min': 24,
-            'winter_long_max': 96,
-            'winter_short_outages': 15,
-            'winter_short_min': 2,
-            'winter_short_max': 12,
-        },
-        'severe': {
-            'summer_long_outages': 3,
-            'summer_long_min': 18,
-            'summer_long_max': 60,
-            'summer_short_outages': 8,
-            'summer_short_min': 2,
-            'summer_short_max': 8,
-            'winter_long_outages': 10,
-            'winter_long_min': 36,
-            'winter_long_max': 120,
-            'winter_short_outages': 25,
-            'winter_short_min': 3,
-            'winter_short_max': 16,
-        },
-        'extreme': {
-            'summer_long_outages': 4,
-            'summer_long_min': 24,
-            'summer_long_max': 72,
-            'summer_short_outages': 12,
-            'summer_short_min': 2,
-            'summer_short_max': 10,
-            'winter_long_outages': 15,
-            'winter_long_min': 48,
-            'winter_long_max': 168,  # Up to 1 week
-            'winter_short_outages': 35,
-            'winter_short_min': 4,
-            'winter_short_max': 20,
-        }
-    }
-    
     print("=" * 70)
     print(f"Generating Seasonal Power Outages - {args.profile.upper()} Profile")
     print("=" * 70)
     
-    profile_params = profiles[args.profile]
     generate_seasonal_outages(
         seed=args.seed,
-        output_file=args.output,
-        **profile_params
+        output_file=args.output or f'input_data/grid_stability_seasonal.{args.format}',
+        output_format=args.format,
+        **PROFILES[args.profile]
     )
     
     print("\n" + "=" * 70)
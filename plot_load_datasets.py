@@ -1,28 +1,42 @@
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+try:
+    import pyarrow  # noqa: F401
+    # pyarrow parses CSV files multithreaded; pandas' C engine is the fallback
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
 
 # Path to the dataset folder
 dataset_folder = "Dataset on Hourly Load Profiles for 24 Facilities (8760 hours)"
 
-# List all CSV files in the folder
-files = [f for f in os.listdir(dataset_folder) if f.endswith('.csv')]
 
-for file in files:
+def plot_load_file(file, show=False):
+    """Plot one load profile CSV and save it as <name>.png.
+
+    Args:
+        file: CSV file name inside dataset_folder
+        show: Draw with pyplot and show the figure instead of rendering off-screen
+
+    Returns:
+        True if the plot was saved, False otherwise
+    """
     file_path = os.path.join(dataset_folder, file)
     # Try to read the CSV file
     try:
-        df = pd.read_csv(file_path, parse_dates=True)
+        df = pd.read_csv(file_path, engine=CSV_ENGINE)
     except Exception as e:
         print(f"Could not read {file}: {e}")
-        continue
+        return False
 
     # Try to find a datetime column
-    datetime_col = None
-    for col in df.columns:
-        if 'date' in col.lower() or 'time' in col.lower():
-            datetime_col = col
-            break
+    datetime_col = next((col for col in df.columns
+                         if 'date' in col.lower() or 'time' in col.lower()), None)
 
     if datetime_col:
         df[datetime_col] = pd.to_datetime(df[datetime_col])
@@ -30,12 +44,44 @@ for file in files:
     else:
         df.index = pd.RangeIndex(len(df))
 
+    if show:
+        import matplotlib.pyplot as plt
+        fig = plt.figure()
+    else:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
     # Plot all columns except the index
-    ax = df.plot(title=f"{file} - {df.index[0] if len(df) > 0 else ''}")
-    plt.xlabel('Datetime' if datetime_col else 'Index')
-    plt.ylabel('Value')
-    plt.tight_layout()
+    try:
+        df.plot(ax=ax, title=f"{file} - {df.index[0] if len(df) > 0 else ''}")
+    except TypeError as e:
+        print(f"Could not plot {file}: {e}")
+        return False
+    ax.set_xlabel('Datetime' if datetime_col else 'Index')
+    ax.set_ylabel('Value')
+    fig.tight_layout()
     image_filename = os.path.splitext(file)[0] + ".png"
-    plt.savefig(image_filename)
-    plt.show(block=False)
-    plt.pause(0.1)
\ No newline at end of file
+    fig.savefig(image_filename)
+    if show:
+        plt.show(block=False)
+        plt.pause(0.1)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Plot the hourly load profile datasets.')
+    parser.add_argument('--show', action='store_true',
+                        help='Show each figure in an interactive window after saving')
+    args = parser.parse_args()
+
+    # List all CSV files in the folder
+    files = [f for f in os.listdir(dataset_folder) if f.endswith('.csv')]
+
+    if args.show:
+        for file in files:
+            plot_load_file(file, show=True)
+    else:
+        # Figures are independent, so render them off-screen in parallel
+        with ProcessPoolExecutor() as ex:
+            list(ex.map(plot_load_file, files))
@@ -3,15 +3,26 @@ Main simulation script for the energy system.
 """
 
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
+from types import MappingProxyType
 import pandas as pd
+import numpy as np
 import yaml
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 from energy_system import EnergySystem, load_input_data
 from generate_input_data import generate_sample_data
 
+try:
+    # libyaml's C parser; the pure-Python SafeLoader is the fallback
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as YAML_LOADER
+
 
 def hours_to_dates(num_hours, start_date='2024-01-01'):
     """
@@ -28,14 +39,152 @@ def hours_to_dates(num_hours, start_date='2024-01-01'):
     return [start + timedelta(hours=i) for i in range(num_hours)]
 
 
-def plot_cumulative_energy(results: pd.DataFrame, save_path: str = None):
+# Defaults of the settings that can only be given in a config file
+CONFIG_DEFAULTS = MappingProxyType({
+    # Targets for scaling
+    'target_pv_peak_kw': None,
+    'target_annual_load_kwh': None,
+    # Fallback to manual scale factors if targets not set
+    'solar_scale_factor': 1.0,
+    'load_scale_factor': 1.0,
+    # Date range for simulation
+    'start_date': None,
+    'end_date': None,
+    # Cost parameters
+    'grid_import_cost': None,
+    'grid_export_price': None,
+    'diesel_cost_per_kwh': None,
+    # Seasonal battery management
+    'winter_months': (),
+    'winter_min_soc': 0.0,
+    'outage_min_soc': 0.0,
+})
+
+
+# Input files already seen to exist (input paths repeat across sizing runs)
+_EXISTING_FILES = set()
+
+
+def _file_exists(file_path: str) -> bool:
+    """Check whether an input file exists; only positive results are remembered."""
+    if file_path in _EXISTING_FILES:
+        return True
+    if os.path.exists(file_path):
+        _EXISTING_FILES.add(file_path)
+        return True
+    # A missing file is checked again next time, so it is found once created
+    return False
+
+
+def load_csv_column(file_path, usecol: int = 0, skiprows: int = 0, dtype=np.float64) -> np.ndarray:
+    """
+    Parse one numeric or True/False column of a plain CSV file with numpy.
+    
+    Args:
+        file_path: Path to the CSV file
+        usecol: Index of the column to read
+        skiprows: Number of header lines to skip
+        dtype: np.float64 for values, bool for True/False (or 1/0) flags
+        
+    Returns:
+        Writable array with the column values
+    """
+    if dtype is bool:
+        # Only the first character is needed to tell True/true/1 from False/false/0
+        flags = np.loadtxt(file_path, delimiter=',', usecols=usecol, skiprows=skiprows,
+                           dtype='S1', ndmin=1)
+        return np.isin(flags, (b'T', b't', b'1'))
+    return np.loadtxt(file_path, delimiter=',', usecols=usecol, skiprows=skiprows,
+                      dtype=dtype, ndmin=1)
+
+
+def read_values_column(file_path, column: str, dtype=np.float64) -> np.ndarray:
+    """
+    Read one input column from a file that may or may not have a header.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+        column: Column name to use when the file has a header
+        dtype: Result dtype (np.float64 or bool)
+        
+    Returns:
+        Writable array with the column values
+    """
+    if str(file_path).endswith('.parquet'):
+        df = pd.read_parquet(file_path)
+        values = df[column] if column in df.columns else df.iloc[:, 1]
+        return np.array(values, dtype=dtype)
+    # Check the first line for a header, so the file is parsed only once
+    with open(file_path) as f:
+        names = [name.strip().strip('"') for name in f.readline().split(',')]
+    if column in names:
+        return load_csv_column(file_path, names.index(column), skiprows=1, dtype=dtype)
+    if 'hour' in names and len(names) > 1:
+        return load_csv_column(file_path, 1, skiprows=1, dtype=dtype)
+    # No header, read as values only
+    return load_csv_column(file_path, 0, dtype=dtype)
+
+
+@lru_cache(maxsize=16)
+def _cached_values_column(file_path: str, mtime: float, column: str, dtype) -> np.ndarray:
+    """Parse an input column once per file version; the shared result is read-only."""
+    values = read_values_column(file_path, column, dtype)
+    values.setflags(write=False)
+    return values
+
+
+def cached_values_column(file_path, column: str, dtype=np.float64) -> np.ndarray:
+    """
+    Read an input column, reusing the parsed values while the file is unchanged.
+    
+    Args:
+        file_path: Path to a CSV or Parquet file
+        column: Column name to use when the file has a header
+        dtype: Result dtype (np.float64 or bool)
+        
+    Returns:
+        Writable copy of the column values
+    """
+    file_path = str(file_path)
+    # The modification time is part of the key, so an edited file is parsed again
+    return _cached_values_column(file_path, os.path.getmtime(file_path), column, dtype).copy()
+
+
+def trim_to_common_length(irradiation: np.ndarray, load: np.ndarray, grid: np.ndarray,
+                          log=print):
+    """
+    Trim the three input arrays to the length of the shortest one.
+    
+    Args:
+        irradiation: Solar irradiation values
+        load: Load consumption values
+        grid: Grid stability values
+        log: Function used for the length warning (default: print)
+        
+    Returns:
+        Tuple of (irradiation, load, grid), unchanged if the lengths already match
+    """
+    lengths = (len(irradiation), len(load), len(grid))
+    min_length = min(lengths)
+    if lengths == (min_length,) * 3:
+        return irradiation, load, grid
+    log(f"  Warning: Input files have different lengths (solar={lengths[0]}, load={lengths[1]}, grid={lengths[2]})")
+    log(f"  Trimming all to minimum length: {min_length}")
+    return irradiation[:min_length], load[:min_length], grid[:min_length]
+
+
+def plot_cumulative_energy(results: pd.DataFrame, save_path: str = None, log=print):
     """
     Plot cumulative energy flows over time.
     
     Args:
         results: DataFrame with simulation results
         save_path: Path to save the plot (optional)
+        log: Function used for the saved-file messages (default: print)
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
     
     # Convert hours to dates
@@ -93,13 +242,13 @@ def plot_cumulative_energy(results: pd.DataFrame, save_path: str = None):
             'net_grid': net_grid
         })
         plot_data.to_csv(f"{base_path}_data.csv", index=True)
-        print(f"Plot data saved to {base_path}_data.csv")
+        log(f"Plot data saved to {base_path}_data.csv")
         
         # Save PNG and SVG
         plt.savefig(f"{base_path}.png", dpi=150, bbox_inches='tight')
-        print(f"Plot saved to {base_path}.png")
+        log(f"Plot saved to {base_path}.png")
         plt.savefig(f"{base_path}.svg", format='svg', bbox_inches='tight')
-        print(f"Plot saved to {base_path}.svg")
+        log(f"Plot saved to {base_path}.svg")
         plt.close()
     else:
         plt.show()
@@ -141,7 +290,7 @@ def simulate_baseline_system(data: pd.DataFrame, grid_import_cost: float,
 
 def plot_cost_over_time(results: pd.DataFrame, data: pd.DataFrame, 
                        grid_import_cost: float, grid_export_price: float,
-                       diesel_cost_per_kwh: float, save_path: str = None):
+                       diesel_cost_per_kwh: float, save_path: str = None, log=print):
     """
     Plot cumulative costs over time for both systems.
     
@@ -152,24 +301,23 @@ def plot_cost_over_time(results: pd.DataFrame, data: pd.DataFrame,
         grid_export_price: Price per kWh for grid export
         diesel_cost_per_kwh: Cost per kWh from diesel
         save_path: Path to save the plot (optional)
+        log: Function used for the saved-file messages (default: print)
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    
     fig, ax = plt.subplots(1, 1, figsize=(14, 8))
     
     # Convert hours to dates
     dates = hours_to_dates(len(data))
     
-    # Calculate baseline cumulative costs
-    baseline_grid_cost = []
-    baseline_diesel_cost = []
-    for i in range(len(data)):
-        if data.iloc[i]['grid_stable']:
-            baseline_grid_cost.append(data.iloc[i]['load_kw'] * grid_import_cost)
-            baseline_diesel_cost.append(0)
-        else:
-            baseline_grid_cost.append(0)
-            baseline_diesel_cost.append(data.iloc[i]['load_kw'] * diesel_cost_per_kwh)
+    # Calculate baseline cumulative costs (grid price while stable, diesel otherwise)
+    load_kw = data['load_kw'].to_numpy(dtype=np.float64)
+    grid_stable = data['grid_stable'].to_numpy(dtype=bool)
+    baseline_cost = np.where(grid_stable, load_kw * grid_import_cost,
+                             load_kw * (diesel_cost_per_kwh or 0))
     
-    cumulative_baseline = (pd.Series(baseline_grid_cost) + pd.Series(baseline_diesel_cost)).cumsum()
+    cumulative_baseline = pd.Series(baseline_cost).cumsum()
     
     # Calculate solar system cumulative costs (negative = profit)
     solar_import_costs = results['grid_import'] * grid_import_cost
@@ -226,20 +374,20 @@ def plot_cost_over_time(results: pd.DataFrame, data: pd.DataFrame,
             'savings': cumulative_baseline - cumulative_solar
         })
         plot_data.to_csv(f"{base_path}_data.csv", index=True)
-        print(f"Plot data saved to {base_path}_data.csv")
+        log(f"Plot data saved to {base_path}_data.csv")
         
         # Save PNG and SVG
         plt.savefig(f"{base_path}.png", dpi=150, bbox_inches='tight')
-        print(f"Plot saved to {base_path}.png")
+        log(f"Plot saved to {base_path}.png")
         plt.savefig(f"{base_path}.svg", format='svg', bbox_inches='tight')
-        print(f"Plot saved to {base_path}.svg")
+        log(f"Plot saved to {base_path}.svg")
         plt.close()
     else:
         plt.show()
 
 
 def plot_cost_comparison(baseline_costs: dict, solar_import_cost: float, 
-                        solar_export_revenue: float, save_path: str = None):
+                        solar_export_revenue: float, save_path: str = None, log=print):
     """
     Create a graphical comparison of costs between baseline and solar+battery systems.
     
@@ -248,7 +396,10 @@ def plot_cost_comparison(baseline_costs: dict, solar_import_cost: float,
         solar_import_cost: Cost for grid import in solar system
         solar_export_revenue: Revenue from grid export in solar system
         save_path: Path to save the plot (optional)
+        log: Function used for the saved-file messages (default: print)
     """
+    import matplotlib.pyplot as plt
+    
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
     # Plot 1: Cost Breakdown Comparison
@@ -334,13 +485,13 @@ def plot_cost_comparison(baseline_costs: dict, solar_import_cost: float,
             'net_cost': net_values
         })
         plot_data.to_csv(f"{base_path}_data.csv", index=False)
-        print(f"Plot data saved to {base_path}_data.csv")
+        log(f"Plot data saved to {base_path}_data.csv")
         
         # Save PNG and SVG
         plt.savefig(f"{base_path}.png", dpi=150, bbox_inches='tight')
-        print(f"Plot saved to {base_path}.png")
+        log(f"Plot saved to {base_path}.png")
         plt.savefig(f"{base_path}.svg", format='svg', bbox_inches='tight')
-        print(f"Plot saved to {base_path}.svg")
+        log(f"Plot saved to {base_path}.svg")
         plt.close()
     else:
         plt.show()
@@ -351,7 +502,9 @@ def run_simulation(irradiation_file: str, load_file: str, grid_stability_file: s
                   battery_efficiency: float = 0.95, battery_self_discharge: float = 0.0001,
                   timestep_hours: float = 1.0, output_dir: str = "output",
                   start_index: int = 0, values_only: bool = False,
-                  config: dict = None):
+                  config: dict = None, save_results: bool = True,
+                  output_format: str = 'csv', save_plots: bool = True,
+                  verbose: bool = True):
     """
     Run the energy system simulation.
     
@@ -364,91 +517,77 @@ def run_simulation(irradiation_file: str, load_file: str, grid_stability_file: s
         battery_efficiency: Battery charge/discharge efficiency
         battery_self_discharge: Battery self-discharge rate per time step
         timestep_hours: Time step duration in hours
-        output_dir: Directory to save output files
+        output_dir: Directory to save output files, or None to write nothing to disk
+        save_results: Write the time-series results (and blackout events) to output_dir
+        output_format: 'csv' (default) or 'parquet' (requires pyarrow) for the results file
+        save_plots: Render and save the plots
+        verbose: Print progress and the summary (pass False in sweeps)
+        
+    Returns:
+        DataFrame with simulation results
     """
-    print("=" * 60)
-    print("Energy System Simulation")
-    print("=" * 60)
-    
-    # Create output directory
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-    
+    log = print if verbose else (lambda *args, **kwargs: None)
+    log("=" * 60)
+    log("Energy System Simulation")
+    log("=" * 60)
 
-    # If config is provided, override all file paths and parameters
+    # Start from the arguments and the defaults of the config-only settings;
+    # if config is provided, it overrides all file paths and parameters
+    settings = {
+        'solar_file': irradiation_file,
+        'load_file': load_file,
+        'outage_file': grid_stability_file,
+        'pv_peak_kw': pv_peak_kw,
+        'battery_capacity_kwh': battery_capacity_kwh,
+        'battery_efficiency': battery_efficiency,
+        'battery_self_discharge': battery_self_discharge,
+        'timestep_hours': timestep_hours,
+        'output_dir': output_dir,
+        'start_index': start_index,
+        'values_only': values_only if config is None else True,
+        **CONFIG_DEFAULTS,
+    }
     if config is not None:
-        print("\nLoading configuration from config file...")
-        irradiation_file = config.get('solar_file', irradiation_file)
-        load_file = config.get('load_file', load_file)
-        grid_stability_file = config.get('outage_file', grid_stability_file)
-        pv_peak_kw = config.get('pv_peak_kw', pv_peak_kw)
-        battery_capacity_kwh = config.get('battery_capacity_kwh', battery_capacity_kwh)
-        battery_efficiency = config.get('battery_efficiency', battery_efficiency)
-        battery_self_discharge = config.get('battery_self_discharge', battery_self_discharge)
-        timestep_hours = config.get('timestep_hours', timestep_hours)
-        output_dir = config.get('output_dir', output_dir)
-        start_index = config.get('start_index', start_index)
-        values_only = config.get('values_only', True)
-        # New: targets for scaling
-        target_pv_peak_kw = config.get('target_pv_peak_kw', None)
-        target_annual_load_kwh = config.get('target_annual_load_kwh', None)
-        # Fallback to manual scale factors if targets not set
-        solar_scale_factor = config.get('solar_scale_factor', 1.0)
-        load_scale_factor = config.get('load_scale_factor', 1.0)
-        # Date range for simulation
-        start_date = config.get('start_date', None)
-        end_date = config.get('end_date', None)
-        # Cost parameters
-        grid_import_cost = config.get('grid_import_cost', None)
-        grid_export_price = config.get('grid_export_price', None)
-        diesel_cost_per_kwh = config.get('diesel_cost_per_kwh', None)
-        # Seasonal battery management
-        winter_months = config.get('winter_months', [])
-        winter_min_soc = config.get('winter_min_soc', 0.0)
-        outage_min_soc = config.get('outage_min_soc', 0.0)
+        log("\nLoading configuration from config file...")
+        settings.update(config)
+    (irradiation_file, load_file, grid_stability_file, pv_peak_kw, battery_capacity_kwh,
+     battery_efficiency, battery_self_discharge, timestep_hours, output_dir, start_index,
+     values_only) = itemgetter(
+        'solar_file', 'load_file', 'outage_file', 'pv_peak_kw', 'battery_capacity_kwh',
+        'battery_efficiency', 'battery_self_discharge', 'timestep_hours', 'output_dir',
+        'start_index', 'values_only')(settings)
+    (target_pv_peak_kw, target_annual_load_kwh, solar_scale_factor, load_scale_factor,
+     start_date, end_date, grid_import_cost, grid_export_price, diesel_cost_per_kwh,
+     winter_months, winter_min_soc, outage_min_soc) = itemgetter(*CONFIG_DEFAULTS)(settings)
+
+    # Create output directory; without one the run stays in memory
+    if output_dir is None:
+        save_results = save_plots = False
     else:
-        target_pv_peak_kw = None
-        target_annual_load_kwh = None
-        solar_scale_factor = 1.0
-        load_scale_factor = 1.0
-        start_date = None
-        end_date = None
-        grid_import_cost = None
-        grid_export_price = None
-        diesel_cost_per_kwh = None
-        winter_months = []
-        winter_min_soc = 0.0
-        outage_min_soc = 0.0
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
     # Load input data
-    print("\nLoading input data...")
+    log("\nLoading input data...")
     if values_only:
-        print(f"  Using values-only input files:")
-        print(f"    Solar: {irradiation_file}")
-        print(f"    Load: {load_file}")
-        print(f"    Outages: {grid_stability_file}")
+        log(f"  Using values-only input files:")
+        log(f"    Solar: {irradiation_file}")
+        log(f"    Load: {load_file}")
+        log(f"    Outages: {grid_stability_file}")
         
-        # Load solar (no header)
-        irradiation = pd.read_csv(irradiation_file, header=None).iloc[:, 0]
-        
-        # Load load file - check if it has headers
-        load_df = pd.read_csv(load_file)
-        if 'load_kw' in load_df.columns:
-            load = load_df['load_kw'].values
-        elif 'hour' in load_df.columns and len(load_df.columns) > 1:
-            load = load_df.iloc[:, 1].values
-        else:
-            # No header, read as values only
-            load = pd.read_csv(load_file, header=None).iloc[:, 0].values
-        
-        # Load grid file - check if it has headers
-        grid_df = pd.read_csv(grid_stability_file)
-        if 'grid_stable' in grid_df.columns:
-            grid = grid_df['grid_stable'].values
-        elif 'hour' in grid_df.columns and len(grid_df.columns) > 1:
-            grid = grid_df.iloc[:, 1].values
-        else:
-            # No header, read as values only
-            grid = pd.read_csv(grid_stability_file, header=None).iloc[:, 0].values
+        # The three files are independent, so read them concurrently; each may
+        # or may not have a header
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            irradiation_future = ex.submit(cached_values_column, irradiation_file, 'irradiation_w_m2')
+            load_future = ex.submit(cached_values_column, load_file, 'load_kw')
+            grid_future = ex.submit(cached_values_column, grid_stability_file, 'grid_stable', bool)
+        # Plain contiguous arrays owned by this run (copies of the cached parse), so
+        # the scaling below can work in place; the grid state is one byte per step.
+        # Energy inputs stay float64, since float32 totals over a year drift visibly
+        # in the summary
+        irradiation = irradiation_future.result()
+        load = load_future.result()
+        grid = grid_future.result()
 
         # --- Scaling logic ---
         # Solar: scale so that sum(irradiation) * pv_peak_kw = target annual generation (if target_pv_peak_kw is set)
@@ -468,79 +607,73 @@ def run_simulation(irradiation_file: str, load_file: str, grid_stability_file: s
             current_annual_load = load.sum() * timestep_hours
             if current_annual_load > 0:
                 load_scale_factor = target_annual_load_kwh / current_annual_load
-                print(f"  Scaling load: current annual={current_annual_load:.2f} kWh, target={target_annual_load_kwh:.2f} kWh, factor={load_scale_factor:.4f}")
-                load = load * load_scale_factor
+                log(f"  Scaling load: current annual={current_annual_load:.2f} kWh, target={target_annual_load_kwh:.2f} kWh, factor={load_scale_factor:.4f}")
+                load *= load_scale_factor
         # If solar_scale_factor is set and no target_pv_peak_kw, apply it
         if solar_scale_factor != 1.0 and target_pv_peak_kw is None:
-            irradiation = irradiation * solar_scale_factor
+            irradiation *= solar_scale_factor
         # If load_scale_factor is set and no target_annual_load_kwh, apply it
         if load_scale_factor != 1.0 and target_annual_load_kwh is None:
-            load = load * load_scale_factor
+            load *= load_scale_factor
 
         # Ensure all arrays have the same length
-        min_length = min(len(irradiation), len(load), len(grid))
-        if len(irradiation) != len(load) or len(irradiation) != len(grid):
-            print(f"  Warning: Input files have different lengths (solar={len(irradiation)}, load={len(load)}, grid={len(grid)})")
-            print(f"  Trimming all to minimum length: {min_length}")
-            irradiation = irradiation[:min_length]
-            load = load[:min_length]
-            grid = grid[:min_length]
+        irradiation, load, grid = trim_to_common_length(irradiation, load, grid, log)
 
+        # Wrap the loaded arrays without copying them again
         data = pd.DataFrame({
             'irradiation_w_m2': irradiation,
             'load_kw': load,
             'grid_stable': grid,
-        })
+        }, copy=False)
     else:
-        print(f"  Solar irradiation: {irradiation_file}")
-        print(f"  Load consumption: {load_file}")
-        print(f"  Grid stability: {grid_stability_file}")
+        log(f"  Solar irradiation: {irradiation_file}")
+        log(f"  Load consumption: {load_file}")
+        log(f"  Grid stability: {grid_stability_file}")
         data = load_input_data(irradiation_file, load_file, grid_stability_file)
         # Optionally scale if not values_only (for completeness)
-        data['irradiation_w_m2'] = data['irradiation_w_m2'] * solar_scale_factor
-        data['load_kw'] = data['load_kw'] * load_scale_factor
-    print(f"  Loaded {len(data)} time steps")
+        if solar_scale_factor != 1.0:
+            data['irradiation_w_m2'] *= solar_scale_factor
+        if load_scale_factor != 1.0:
+            data['load_kw'] *= load_scale_factor
+    log(f"  Loaded {len(data)} time steps")
 
     # Handle date range if specified (convert dates to hour indices)
     if start_date is not None or end_date is not None:
-        from datetime import datetime
         # Assume year starts at hour 0 = Jan 1, 00:00
-        year_start = datetime(2024, 1, 1)  # Use 2024 as reference (leap year with 8784 hours)
+        year_start = np.datetime64('2024-01-01', 'D')  # Use 2024 as reference (leap year with 8784 hours)
+        hour = np.timedelta64(1, 'h')
         
         if start_date is not None:
-            # Convert to string if it's already a date object
-            if not isinstance(start_date, str):
-                start_date = start_date.strftime('%Y-%m-%d')
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            start_index = int((start_dt - year_start).total_seconds() / 3600)
-            print(f"  Start date: {start_date} (hour {start_index})")
+            # Accepts a 'YYYY-MM-DD' string or a date object; kept as a string for later use
+            start_day = np.datetime64(start_date, 'D')
+            start_date = str(start_day)
+            start_index = int((start_day - year_start) // hour)
+            log(f"  Start date: {start_date} (hour {start_index})")
         
         if end_date is not None:
-            # Convert to string if it's already a date object
-            if not isinstance(end_date, str):
-                end_date = end_date.strftime('%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-            end_index = int((end_dt - year_start).total_seconds() / 3600)
-            print(f"  End date: {end_date} (hour {end_index})")
+            end_day = np.datetime64(end_date, 'D')
+            end_date = str(end_day)
+            end_index = int((end_day - year_start) // hour)
+            log(f"  End date: {end_date} (hour {end_index})")
             data = data.iloc[start_index:end_index].reset_index(drop=True)
         else:
             data = data.iloc[start_index:].reset_index(drop=True)
         
-        print(f"  Simulation period: {len(data)} hours")
+        log(f"  Simulation period: {len(data)} hours")
     elif start_index > 0:
-        print(f"  Slicing data from start index: {start_index}")
+        log(f"  Slicing data from start index: {start_index}")
         data = data.iloc[start_index:].reset_index(drop=True)
     
     # Initialize energy system
-    print("\nInitializing energy system...")
-    print(f"  PV peak power: {pv_peak_kw} kW")
-    print(f"  Battery capacity: {battery_capacity_kwh} kWh")
-    print(f"  Battery efficiency: {battery_efficiency * 100}%")
-    print(f"  Battery self-discharge: {battery_self_discharge * 100}% per time step")
+    log("\nInitializing energy system...")
+    log(f"  PV peak power: {pv_peak_kw} kW")
+    log(f"  Battery capacity: {battery_capacity_kwh} kWh")
+    log(f"  Battery efficiency: {battery_efficiency * 100}%")
+    log(f"  Battery self-discharge: {battery_self_discharge * 100}% per time step")
     if winter_months and winter_min_soc > 0:
-        print(f"  Winter reserve: {winter_min_soc * 100}% SOC in months {winter_months}")
+        log(f"  Winter reserve: {winter_min_soc * 100}% SOC in months {winter_months}")
     if outage_min_soc is not None:
-        print(f"  Outage reserve minimum SOC: {outage_min_soc * 100}% (allowed during outages)")
+        log(f"  Outage reserve minimum SOC: {outage_min_soc * 100}% (allowed during outages)")
     
     system = EnergySystem(
         pv_peak_kw=pv_peak_kw,
@@ -553,7 +686,7 @@ def run_simulation(irradiation_file: str, load_file: str, grid_stability_file: s
     )
     
     # Run simulation
-    print("\nRunning simulation...")
+    log("\nRunning simulation...")
     # Convert start_date string to datetime if provided
     sim_start_date = None
     if start_date:
@@ -630,135 +763,180 @@ def run_simulation(irradiation_file: str, load_file: str, grid_stability_file: s
         })
     
     # Save results
-    results_file = output_path / "simulation_results.csv"
-    results.to_csv(results_file)
-    print(f"\nResults saved to: {results_file}")
+    if save_results:
+        results_file = output_path / f"simulation_results.{output_format}"
+        if output_format == 'parquet':
+            results.to_parquet(results_file, compression='zstd')
+        else:
+            results.to_csv(results_file)
+        log(f"\nResults saved to: {results_file}")
+    
+    # The summary is collected as lines and logged in one call
+    lines = []
     
     # Export blackout events if any
     if blackout_events:
         be_df = pd.DataFrame(blackout_events)
-        be_df.to_csv(output_path / 'blackout_events.csv', index=False)
+        if save_results:
+            be_df.to_csv(output_path / 'blackout_events.csv', index=False)
         total_blackout_hours = int(results['blackout'].sum())
         total_events = len(be_df)
         worst = int(be_df['duration_hours'].max())
         total_unserved = float(be_df['unserved_energy_kwh'].sum())
-        print(f"\n--- Resilience Summary (Blackouts) ---")
-        print(f"Blackout events: {total_events}")
-        print(f"Total blackout hours: {total_blackout_hours}")
-        print(f"Longest blackout: {worst} hours")
-        print(f"Total unserved energy: {total_unserved:.2f} kWh")
-        print(f"Details saved to: {output_path / 'blackout_events.csv'}")
+        lines += [
+            f"\n--- Resilience Summary (Blackouts) ---",
+            f"Blackout events: {total_events}",
+            f"Total blackout hours: {total_blackout_hours}",
+            f"Longest blackout: {worst} hours",
+            f"Total unserved energy: {total_unserved:.2f} kWh",
+        ]
+        if save_results:
+            lines.append(f"Details saved to: {output_path / 'blackout_events.csv'}")
     else:
-        print(f"\n--- Resilience Summary (Blackouts) ---")
-        print(f"No blackout events. All load served across the period.")
+        lines += [
+            f"\n--- Resilience Summary (Blackouts) ---",
+            f"No blackout events. All load served across the period.",
+        ]
     
     # Calculate summary statistics
-    print("\n" + "=" * 60)
-    print("Simulation Summary")
-    print("=" * 60)
-    
-    total_pv_generation = results['pv_generation_kwh'].sum()
-    total_load = results['load_kwh'].sum()
-    total_grid_import = results['grid_import'].sum()
-    total_grid_export = results['grid_export'].sum()
-    avg_self_sufficiency = results['self_sufficiency'].mean()
-    total_unmet_load = results['unmet_load'].sum()
-    
-    print(f"\nTotal PV generation: {total_pv_generation:.2f} kWh")
-    print(f"Total load consumption: {total_load:.2f} kWh")
-    print(f"Total grid import: {total_grid_import:.2f} kWh")
-    print(f"Total grid export: {total_grid_export:.2f} kWh")
-    print(f"Net grid energy: {total_grid_import - total_grid_export:.2f} kWh")
-    print(f"Average self-sufficiency: {avg_self_sufficiency * 100:.2f}%")
-    print(f"Total unmet load: {total_unmet_load:.2f} kWh")
+    lines += ["\n" + "=" * 60, "Simulation Summary", "=" * 60]
+    
+    # One reduction over the summed columns instead of one pandas call per column
+    (total_pv_generation, total_load, total_grid_import, total_grid_export,
+     total_self_sufficiency, total_unmet_load) = results[
+        ['pv_generation_kwh', 'load_kwh', 'grid_import', 'grid_export',
+         'self_sufficiency', 'unmet_load']].to_numpy().sum(axis=0)
+    avg_self_sufficiency = total_self_sufficiency / len(results)
+    
+    lines += [
+        f"\nTotal PV generation: {total_pv_generation:.2f} kWh",
+        f"Total load consumption: {total_load:.2f} kWh",
+        f"Total grid import: {total_grid_import:.2f} kWh",
+        f"Total grid export: {total_grid_export:.2f} kWh",
+        f"Net grid energy: {total_grid_import - total_grid_export:.2f} kWh",
+        f"Average self-sufficiency: {avg_self_sufficiency * 100:.2f}%",
+        f"Total unmet load: {total_unmet_load:.2f} kWh",
+    ]
     
     # Calculate costs if specified
     if grid_import_cost is not None or grid_export_price is not None:
-        print("\n" + "-" * 60)
-        print("Financial Summary")
-        print("-" * 60)
+        lines += ["\n" + "-" * 60, "Financial Summary", "-" * 60]
         if grid_import_cost is not None:
             import_cost = total_grid_import * grid_import_cost
-            print(f"Grid import cost: €{import_cost:,.2f} (@ €{grid_import_cost}/kWh)")
+            lines.append(f"Grid import cost: €{import_cost:,.2f} (@ €{grid_import_cost}/kWh)")
         if grid_export_price is not None:
             export_revenue = total_grid_export * grid_export_price
-            print(f"Grid export revenue: €{export_revenue:,.2f} (@ €{grid_export_price}/kWh)")
+            lines.append(f"Grid export revenue: €{export_revenue:,.2f} (@ €{grid_export_price}/kWh)")
         if grid_import_cost is not None and grid_export_price is not None:
             net_balance = export_revenue - import_cost
-            print(f"\nNet electricity balance: €{net_balance:,.2f}")
+            lines.append(f"\nNet electricity balance: €{net_balance:,.2f}")
             if net_balance > 0:
-                print(f"  → Net profit: €{net_balance:,.2f} (You earned money!)")
+                lines.append(f"  → Net profit: €{net_balance:,.2f} (You earned money!)")
             else:
-                print(f"  → Net cost: €{abs(net_balance):,.2f} (You paid this amount)")
+                lines.append(f"  → Net cost: €{abs(net_balance):,.2f} (You paid this amount)")
 
     
-    battery_cycles = results['battery_soc'].diff().abs().sum() / 2
-    print(f"\nBattery charge/discharge cycles: {battery_cycles:.2f}")
-    print(f"Final battery SOC: {results['battery_soc'].iloc[-1] * 100:.2f}%")
-    
-    grid_stable_ratio = data['grid_stable'].sum() / len(data)
-    print(f"\nGrid stability: {grid_stable_ratio * 100:.2f}%")
+    soc_steps = np.diff(results['battery_soc'].to_numpy())
+    battery_cycles = np.abs(soc_steps, out=soc_steps).sum() / 2
+    lines += [
+        f"\nBattery charge/discharge cycles: {battery_cycles:.2f}",
+        f"Final battery SOC: {results['battery_soc'].iloc[-1] * 100:.2f}%",
+    ]
     
-    # Create visualization
-    print("\nGenerating plots...")
-    plot_file = output_path / "simulation_results.png"
-    system.plot_results(results, save_path=str(plot_file))
-    print(f"Plots saved to: {plot_file}")
+    # grid_stable is a one-byte bool column on every load path; count it without upcasting
+    grid_stable_ratio = np.count_nonzero(data['grid_stable'].to_numpy()) / len(data)
+    lines.append(f"\nGrid stability: {grid_stable_ratio * 100:.2f}%")
+    log("\n".join(lines))
     
-    # Create cumulative energy flow plot
-    print("Generating cumulative energy flow plot...")
-    cumulative_plot_file = output_path / "cumulative_energy_flows.png"
-    plot_cumulative_energy(results, save_path=str(cumulative_plot_file))
-    print(f"Cumulative energy plot saved to: {cumulative_plot_file}")
+    if save_plots:
+        # Create visualization
+        log("\nGenerating plots...")
+        plot_file = output_path / "simulation_results.png"
+        fig = system.plot_results(results, save_path=str(plot_file), log=log)
+        # Close the saved figure, so repeated runs (e.g. batch workers) do not accumulate figures
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+        log(f"Plots saved to: {plot_file}")
+        
+        # Create cumulative energy flow plot
+        log("Generating cumulative energy flow plot...")
+        cumulative_plot_file = output_path / "cumulative_energy_flows.png"
+        plot_cumulative_energy(results, save_path=str(cumulative_plot_file), log=log)
+        log(f"Cumulative energy plot saved to: {cumulative_plot_file}")
     
     # Compare with baseline system (grid + diesel)
     if grid_import_cost is not None:
-        print("\n" + "=" * 60)
-        print("Baseline System Comparison (Grid + Diesel Generator)")
-        print("=" * 60)
+        lines = ["\n" + "=" * 60, "Baseline System Comparison (Grid + Diesel Generator)", "=" * 60]
         
         baseline = simulate_baseline_system(data, grid_import_cost, diesel_cost_per_kwh)
         
-        print(f"\nBaseline System (No Solar/Battery):")
-        print(f"  Grid energy: {baseline['grid_energy']:,.2f} kWh")
-        print(f"  Diesel energy: {baseline['diesel_energy']:,.2f} kWh")
-        print(f"  Grid cost: €{baseline['grid_cost']:,.2f}")
+        lines += [
+            f"\nBaseline System (No Solar/Battery):",
+            f"  Grid energy: {baseline['grid_energy']:,.2f} kWh",
+            f"  Diesel energy: {baseline['diesel_energy']:,.2f} kWh",
+            f"  Grid cost: €{baseline['grid_cost']:,.2f}",
+        ]
         if diesel_cost_per_kwh:
-            print(f"  Diesel cost: €{baseline['diesel_cost']:,.2f}")
-        print(f"  Total cost: €{baseline['total_cost']:,.2f}")
-        
-        print(f"\nSolar + Battery System:")
+            lines.append(f"  Diesel cost: €{baseline['diesel_cost']:,.2f}")
+        lines += [
+            f"  Total cost: €{baseline['total_cost']:,.2f}",
+            f"\nSolar + Battery System:",
+        ]
         if grid_import_cost is not None and grid_export_price is not None:
             solar_system_cost = import_cost - export_revenue
-            print(f"  Net cost: €{-solar_system_cost:,.2f}")
+            lines.append(f"  Net cost: €{-solar_system_cost:,.2f}")
             
             savings = baseline['total_cost'] - (-solar_system_cost)
-            print(f"\n💰 Total Savings: €{savings:,.2f}")
+            lines.append(f"\n💰 Total Savings: €{savings:,.2f}")
             if baseline['total_cost'] > 0:
                 savings_pct = (savings / baseline['total_cost']) * 100
-                print(f"   Cost Reduction: {savings_pct:.1f}%")
-            
+                lines.append(f"   Cost Reduction: {savings_pct:.1f}%")
+        log("\n".join(lines))
+        
+        if save_plots and grid_import_cost is not None and grid_export_price is not None:
             # Create cost comparison plot
-            print("\nGenerating cost comparison chart...")
+            log("\nGenerating cost comparison chart...")
             comparison_plot_file = output_path / "cost_comparison.png"
             plot_cost_comparison(baseline, import_cost, export_revenue, 
-                               save_path=str(comparison_plot_file))
-            print(f"Cost comparison chart saved to: {comparison_plot_file}")
-            
+                               save_path=str(comparison_plot_file), log=log)
+            log(f"Cost comparison chart saved to: {comparison_plot_file}")
+        
             # Create cost over time plot
-            print("Generating cost over time chart...")
+            log("Generating cost over time chart...")
             cost_time_plot_file = output_path / "cost_over_time.png"
             plot_cost_over_time(results, data, grid_import_cost, grid_export_price,
-                              diesel_cost_per_kwh, save_path=str(cost_time_plot_file))
-            print(f"Cost over time chart saved to: {cost_time_plot_file}")
+                              diesel_cost_per_kwh, save_path=str(cost_time_plot_file), log=log)
+            log(f"Cost over time chart saved to: {cost_time_plot_file}")
     
-    print("\n" + "=" * 60)
-    print("Simulation completed successfully!")
-    print("=" * 60)
+    log("\n" + "=" * 60)
+    log("Simulation completed successfully!")
+    log("=" * 60)
     
     return results
 
 
+def _run_config(config: dict, kwargs: dict) -> pd.DataFrame:
+    """Run one quiet simulation for run_simulation_batch (module level, so it can be pickled)."""
+    return run_simulation(config=config, verbose=False, **kwargs)
+
+
+def run_simulation_batch(configs: list, n_jobs: int = None, **kwargs) -> list:
+    """
+    Run independent simulations, one per config, in parallel worker processes.
+    
+    Args:
+        configs: List of config dicts (as loaded from the YAML config files)
+        n_jobs: Number of worker processes (default: one per CPU)
+        **kwargs: Other run_simulation arguments shared by all runs (the input
+            file paths are required and serve as fallbacks for the configs)
+        
+    Returns:
+        List of results DataFrames, in the order of configs
+    """
+    with ProcessPoolExecutor(max_workers=n_jobs) as ex:
+        return list(ex.map(_run_config, configs, repeat(kwargs)))
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -766,6 +944,8 @@ def main():
     )
 
     parser.add_argument('--config', type=str, default=None, help='Path to YAML config file')
+    parser.add_argument('--configs', type=str, default=None, help='Directory of YAML config files to simulate in parallel; each writes to <output-dir>/<config name>')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of parallel simulations for --configs (default: one per CPU)')
 
     # Retain all previous arguments for backward compatibility
     parser.add_argument('--irradiation', type=str, default='input_data/solar_irradiation.csv', help='Path to solar irradiation CSV file')
@@ -781,6 +961,9 @@ def main():
     parser.add_argument('--days', type=int, default=7, help='Number of days for sample data generation (default: 7)')
     parser.add_argument('--values-only', action='store_true', help='Set if the irradiation file contains only values (no header, no timestamps)')
     parser.add_argument('--start-index', type=int, default=0, help='Start simulation from this time index (default: 0)')
+    parser.add_argument('--output-format', choices=['csv', 'parquet'], default='csv', help='File format of the saved results (parquet requires pyarrow)')
+    parser.add_argument('--no-save-results', action='store_true', help='Do not write the time-series results to the output directory')
+    parser.add_argument('--no-plots', action='store_true', help='Skip generating the plots')
 
     args = parser.parse_args()
 
@@ -788,7 +971,21 @@ def main():
     config = None
     if args.config:
         with open(args.config, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YAML_LOADER)
+
+    # A directory of config files is simulated as one batch
+    configs = None
+    if args.configs:
+        config_files = sorted(Path(args.configs).glob('*.y*ml'))
+        configs = []
+        for config_file in config_files:
+            with open(config_file, 'r') as f:
+                batch_config = yaml.load(f, Loader=YAML_LOADER) or {}
+            batch_config['output_dir'] = str(Path(args.output_dir) / config_file.stem)
+            configs.append(batch_config)
+        if not configs:
+            print(f"Error: No YAML config files found in {args.configs}")
+            return
 
     # Generate sample data if requested
     if args.generate_sample_data:
@@ -797,15 +994,17 @@ def main():
         print()
 
     # If using config, check files from config; else, use args
-    if config is not None:
-        input_files = [
-            config.get('solar_file', args.irradiation),
-            config.get('load_file', args.load),
-            config.get('outage_file', args.grid)
-        ]
-    else:
-        input_files = [args.irradiation, args.load, args.grid]
-    missing_files = [f for f in input_files if not Path(f).exists()]
+    input_files = []
+    for checked_config in configs or [config]:
+        if checked_config is not None:
+            input_files += [
+                checked_config.get('solar_file', args.irradiation),
+                checked_config.get('load_file', args.load),
+                checked_config.get('outage_file', args.grid)
+            ]
+        else:
+            input_files += [args.irradiation, args.load, args.grid]
+    missing_files = list(dict.fromkeys(f for f in input_files if not _file_exists(f)))
 
     if missing_files:
         print("Error: Input files not found:")
@@ -814,8 +1013,7 @@ def main():
         print("\nUse --generate-sample-data to create sample input files.")
         return
 
-    # Run simulation
-    run_simulation(
+    simulation_args = dict(
         irradiation_file=args.irradiation,
         load_file=args.load,
         grid_stability_file=args.grid,
@@ -827,9 +1025,25 @@ def main():
         output_dir=args.output_dir,
         start_index=args.start_index,
         values_only=args.values_only,
-        config=config
+        save_results=not args.no_save_results,
+        output_format=args.output_format,
+        save_plots=not args.no_plots
     )
 
+    if configs is not None:
+        print(f"Running {len(configs)} simulations from {args.configs}...")
+        all_results = run_simulation_batch(configs, n_jobs=args.jobs, **simulation_args)
+        print("-" * 80)
+        print(f"{'Config':<30} {'Self-Suff %':<15} {'Grid Import (kWh)':<20} {'Unmet Load (kWh)':<15}")
+        print("-" * 80)
+        for config_file, results in zip(config_files, all_results):
+            print(f"{config_file.stem:<30} {results['self_sufficiency'].mean() * 100:<15.2f} "
+                  f"{results['grid_import'].sum():<20.2f} {results['unmet_load'].sum():<15.2f}")
+        return
+
+    # Run simulation
+    run_simulation(config=config, **simulation_args)
+
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,7 @@ Simple test script to verify the energy system simulation.
 
 import pandas as pd
 import numpy as np
-from energy_system import Battery, PVSystem, EnergySystem
+from energy_system import Battery, PVSystem, EnergySystem, RESULT_COLUMNS
 
 
 def test_battery():
@@ -137,6 +137,163 @@ def test_energy_flow_priority():
     print("✓ Energy Flow Priority tests passed")
 
 
+def test_timestep_matches_simulate():
+    """Test that stepping simulate_timestep reproduces the vectorized simulate."""
+    print("Testing Timestep / Simulate Equivalence...")
+    rng = np.random.default_rng(42)
+    n = 24 * 14
+    test_data = pd.DataFrame({
+        'irradiation_w_m2': rng.uniform(0, 1000, n) * (rng.random(n) < 0.6),
+        'load_kw': rng.uniform(0, 150, n),
+        'grid_stable': rng.random(n) < 0.8
+    })
+    start_date = pd.Timestamp('2024-01-25')
+    
+    results = EnergySystem(pv_peak_kw=120, battery_capacity_kwh=300).simulate(
+        test_data, timestep_hours=1.0, start_date=start_date)
+    
+    system = EnergySystem(pv_peak_kw=120, battery_capacity_kwh=300)
+    for i, row in enumerate(test_data.itertuples(index=False)):
+        month = (start_date + pd.Timedelta(hours=i)).month
+        step = system.simulate_timestep(row.irradiation_w_m2, row.load_kw,
+                                        row.grid_stable, 1.0, month)
+        for column, value in step.items():
+            assert abs(float(results[column].iloc[i]) - float(value)) < 1e-9, \
+                f"{column} differs at timestep {i}: {results[column].iloc[i]} != {value}"
+    
+    print("✓ Timestep / Simulate Equivalence tests passed")
+
+
+def test_timestep_out_arrays():
+    """Test that simulate_timestep filling preallocated arrays matches simulate."""
+    print("Testing Timestep Preallocated Arrays...")
+    rng = np.random.default_rng(11)
+    n = 24 * 7
+    test_data = pd.DataFrame({
+        'irradiation_w_m2': rng.uniform(0, 1000, n) * (rng.random(n) < 0.6),
+        'load_kw': rng.uniform(0, 150, n),
+        'grid_stable': rng.random(n) < 0.8
+    })
+    
+    results = EnergySystem(pv_peak_kw=120, battery_capacity_kwh=300).simulate(test_data)
+    
+    system = EnergySystem(pv_peak_kw=120, battery_capacity_kwh=300)
+    out_arrays = {name: np.empty(n, dtype=bool if name == 'grid_stable' else float)
+                  for name in RESULT_COLUMNS}
+    for i, row in enumerate(test_data.itertuples(index=False)):
+        step = system.simulate_timestep(row.irradiation_w_m2, row.load_kw, row.grid_stable,
+                                        1.0, 1, out_arrays=out_arrays, idx=i)
+        assert step is None, "Nothing should be returned when out_arrays is given"
+    
+    for column in RESULT_COLUMNS:
+        assert np.allclose(results[column].to_numpy(dtype=float), out_arrays[column], atol=1e-9), \
+            f"{column} differs from simulate"
+    
+    print("✓ Timestep Preallocated Arrays tests passed")
+
+
+def test_simulate_dict_input():
+    """Test that simulate accepts a dict of arrays like a DataFrame."""
+    print("Testing Dict Input...")
+    rng = np.random.default_rng(3)
+    n = 24 * 7
+    arrays = {
+        'irradiation_w_m2': rng.uniform(0, 1000, n),
+        'load_kw': rng.uniform(0, 150, n),
+        'grid_stable': rng.random(n) < 0.8
+    }
+    
+    from_df = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200).simulate(pd.DataFrame(arrays))
+    from_dict = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200).simulate(arrays)
+    pd.testing.assert_frame_equal(from_df, from_dict)
+    
+    print("✓ Dict Input tests passed")
+
+
+def test_simulate_float32_results():
+    """Test that float32 results are the float64 simulation stored in float32."""
+    print("Testing Float32 Results...")
+    rng = np.random.default_rng(5)
+    n = 24 * 7
+    test_data = pd.DataFrame({
+        'irradiation_w_m2': rng.uniform(0, 1000, n),
+        'load_kw': rng.uniform(0, 150, n),
+        'grid_stable': rng.random(n) < 0.8
+    })
+    
+    full = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200).simulate(test_data)
+    system = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200)
+    compact = system.simulate(test_data, dtype=np.float32)
+    batch = system.simulate_batch(test_data, np.array([100.0]), np.array([200.0]),
+                                  np.array([system.battery.efficiency]), dtype=np.float32)
+    
+    for column in compact.columns:
+        assert compact[column].dtype == batch[column].dtype, \
+            f"{column} dtype differs from simulate_batch: {compact[column].dtype} != {batch[column].dtype}"
+        expected = full[column].to_numpy()
+        if column not in ('battery_energy_kwh', 'grid_stable'):
+            expected = expected.astype(np.float32)
+        assert np.array_equal(compact[column].to_numpy(), expected), \
+            f"{column} differs from the float64 simulation"
+    
+    print("✓ Float32 Results tests passed")
+
+
+def test_simulate_batch():
+    """Test that a batched parameter sweep matches individual simulations."""
+    print("Testing Batch Simulation...")
+    test_data = pd.DataFrame({
+        'irradiation_w_m2': [1000, 500, 0, 800, 0, 300],
+        'load_kw': [50, 60, 40, 70, 90, 20],
+        'grid_stable': [True, True, False, True, False, True]
+    })
+    pv_peaks = np.array([50.0, 100.0, 150.0])
+    caps = np.array([100.0, 200.0, 50.0])
+    effs = np.array([0.9, 0.95, 0.98])
+    
+    batch = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200).simulate_batch(
+        test_data, pv_peaks, caps, effs)
+    assert batch['battery_soc'].shape == (3, 6), "Results should have shape (scenarios, timesteps)"
+    
+    for m in range(len(pv_peaks)):
+        system = EnergySystem(pv_peak_kw=pv_peaks[m], battery_capacity_kwh=caps[m],
+                              battery_efficiency=effs[m])
+        results = system.simulate(test_data)
+        for column in results.columns:
+            assert np.allclose(results[column].to_numpy(dtype=float), batch[column][m]), \
+                f"{column} differs for scenario {m}"
+    
+    print("✓ Batch Simulation tests passed")
+
+
+def test_simulate_ensemble():
+    """Test that each ensemble realization matches an individual simulation."""
+    print("Testing Ensemble Simulation...")
+    rng = np.random.default_rng(7)
+    irradiation = rng.uniform(0, 1000, (4, 48))
+    load_kw = rng.uniform(0, 120, (4, 48))
+    grid_stable = rng.random((4, 48)) < 0.7
+    
+    system = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200,
+                          winter_months=[12, 1], winter_min_soc=0.5)
+    ensemble = system.simulate_ensemble(irradiation, load_kw, grid_stable)
+    assert ensemble['battery_soc'].shape == (4, 48), "Results should have shape (realizations, timesteps)"
+    
+    for k in range(4):
+        test_data = pd.DataFrame({
+            'irradiation_w_m2': irradiation[k],
+            'load_kw': load_kw[k],
+            'grid_stable': grid_stable[k]
+        })
+        results = EnergySystem(pv_peak_kw=100, battery_capacity_kwh=200,
+                               winter_months=[12, 1], winter_min_soc=0.5).simulate(test_data)
+        for column in results.columns:
+            assert np.allclose(results[column].to_numpy(dtype=float), ensemble[column][k]), \
+                f"{column} differs for realization {k}"
+    
+    print("✓ Ensemble Simulation tests passed")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Running Energy System Tests")
@@ -148,6 +305,12 @@ if __name__ == "__main__":
         test_pv_system()
         test_energy_system()
         test_energy_flow_priority()
+        test_timestep_matches_simulate()
+        test_timestep_out_arrays()
+        test_simulate_dict_input()
+        test_simulate_float32_results()
+        test_simulate_batch()
+        test_simulate_ensemble()
         
         print()
         print("=" * 60)